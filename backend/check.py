@@ -1,6 +1,14 @@
 # Import the pandas library for data manipulation and analysis
 import pandas as pd
 
+# Use pyarrow's multi-threaded CSV parser when it is installed,
+# otherwise fall back to pandas' default C engine.
+try:
+    import pyarrow  # noqa: F401
+    csv_engine = 'pyarrow'
+except ImportError:
+    csv_engine = 'c'
+
 # --- Step 1: Define the list of dataset filenames ---
 # IMPORTANT: Replace these placeholder filenames with the actual names of your four dataset files.
 # Make sure the files are in the same directory as this script.
@@ -15,7 +23,7 @@ dataset_files = [
 for file_name in dataset_files:
     try:
         # Load the dataset from the CSV file
-        df = pd.read_csv(file_name)
+        df = pd.read_csv(file_name, engine=csv_engine)
 
         # --- Section Header for Clarity ---
         print(f"============================================================")
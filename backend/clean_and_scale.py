@@ -1,126 +1,104 @@
 # Import the pandas library for data manipulation
 import pandas as pd
 import numpy as np
-
-# --- Kidney Disease Dataset Cleaning ---
-def clean_kidney_data(file_path):
+from concurrent.futures import ProcessPoolExecutor
+
+# --- Cleaning configuration for each dataset ---
+# Every dataset goes through the same pipeline; only the steps configured here are applied.
+CLEANING_CONFIG = {
+    'kidney': {
+        'input': 'data/kidneydisease.csv',
+        'output': 'data/kidney_cleaned.csv',
+        # Drop the 'id' column if it exists
+        'drop_cols': ['id'],
+        # Replace specific non-standard missing values with numpy NaN
+        'replacements': {'\t?': np.nan, '?': np.nan, '\t': np.nan, 'ckd\t': 'ckd', 'notckd\t': 'notckd'},
+        # Columns that should be numeric but are read as objects
+        'numeric_cols': ['age', 'bp', 'sg', 'al', 'su', 'bgr', 'bu', 'sc', 'sod', 'pot', 'hemo', 'pcv', 'wc', 'rc'],
+        'categorical_cols': ['rbc', 'pc', 'pcc', 'ba', 'htn', 'dm', 'cad', 'appet', 'pe', 'ane', 'classification'],
+    },
+    'diabetes': {
+        'input': 'data/diabetes.csv',
+        'output': 'data/diabetes_cleaned.csv',
+        # Columns where 0 is not a valid value
+        'zero_is_missing_cols': ['Glucose', 'BloodPressure', 'SkinThickness', 'Insulin', 'BMI'],
+    },
+    'heart': {
+        'input': 'data/heart.csv',
+        'output': 'data/heart_cleaned.csv',
+        # Map 'Yes'/'No' to 1/0 for 'HeartDisease' (if needed)
+        'replacements': {'HeartDisease': {'Yes': 1, 'No': 0}},
+        # Map 'M'/'F' to 1/0 for 'Sex' and 'Y'/'N' to 1/0 for 'ExerciseAngina'
+        'value_maps': {'Sex': {'M': 1, 'F': 0}, 'ExerciseAngina': {'Y': 1, 'N': 0}},
+        'categorical_cols': ['ChestPainType', 'RestingECG', 'ST_Slope'],
+    },
+    'hypertension': {
+        'input': 'data/hypertension_dataset.csv',
+        'output': 'data/hypertension_cleaned.csv',
+        'categorical_cols': ['BP_History', 'Medication', 'Exercise_Level', 'Smoking_Status', 'Family_History', 'Has_Hypertension'],
+    },
+}
+
+
+def clean_dataset(name, config):
     """
-    Cleans the 'kidneydisease.csv' dataset by:
-    1. Replacing non-standard missing value indicators with NaN.
-    2. Dropping the 'id' column if it exists.
-    3. Imputing missing numerical values with the mean.
-    4. Converting categorical columns to a numeric format using one-hot encoding.
+    Cleans a single dataset according to its entry in CLEANING_CONFIG by:
+    1. Dropping unused columns if they exist.
+    2. Replacing non-standard missing value indicators and label spellings.
+    3. Converting numeric columns stored as text and imputing missing values with the mean.
+    4. Replacing biologically impossible '0' values with the mean of their column.
+    5. Mapping binary text columns to 1/0.
+    6. Converting categorical columns to a numeric format using one-hot encoding.
     """
-    print("Cleaning kidney_disease dataset...")
+    print(f"Cleaning {name} dataset...")
     # Load the dataset
-    df = pd.read_csv(file_path)
-
-    # Use a try-except block to handle cases where the 'id' column is missing
-    try:
-        df.drop('id', axis=1, inplace=True)
-    except KeyError:
-        print("Warning: 'id' column not found in kidneydisease.csv, skipping drop.")
+    df = pd.read_csv(config['input'])
 
-    # Replace specific non-standard missing values with numpy NaN
-    df.replace({'\t?': np.nan, '?': np.nan, '\t': np.nan, 'ckd\t': 'ckd', 'notckd\t': 'notckd'}, inplace=True)
-
-    # Convert columns to their appropriate data types
-    # Manually convert columns that should be numeric but are read as objects
-    numeric_cols = ['age', 'bp', 'sg', 'al', 'su', 'bgr', 'bu', 'sc', 'sod', 'pot', 'hemo', 'pcv', 'wc', 'rc']
-    for col in numeric_cols:
-        # Check if the column exists before trying to convert
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-    
-    # Impute missing numerical values with the mean of the column
-    for col in numeric_cols:
+    for col in config.get('drop_cols', []):
         if col in df.columns:
-            df[col].fillna(df[col].mean(), inplace=True)
+            df.drop(col, axis=1, inplace=True)
+        else:
+            print(f"Warning: '{col}' column not found in {config['input']}, skipping drop.")
+
+    if 'replacements' in config:
+        df.replace(config['replacements'], inplace=True)
+
+    # Only keep the columns that actually exist in the dataframe
+    numeric_cols = [col for col in config.get('numeric_cols', []) if col in df.columns]
+    if numeric_cols:
+        df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors='coerce')
+
+        # Impute missing numerical values with the mean of each column in a single pass
+        means = df[numeric_cols].mean(numeric_only=True)
+        df[numeric_cols] = df[numeric_cols].fillna(means)
+
+    zero_cols = config.get('zero_is_missing_cols', [])
+    if zero_cols:
+        values = df[zero_cols].to_numpy(dtype=np.float64, copy=True)
+        values[values == 0] = np.nan
+        # Fill the replaced zeros and any values already missing in the input
+        mask = np.isnan(values)
+
+        # Impute missing values with the mean, writing all columns back in one pass
+        col_means = np.nanmean(values, axis=0)
+        rows, cols = np.where(mask)
+        values[rows, cols] = np.take(col_means, cols)
+        df[zero_cols] = values
+
+    for col, mapping in config.get('value_maps', {}).items():
+        df[col] = df[col].map(mapping)
 
-    # One-hot encode the categorical columns
-    categorical_cols = ['rbc', 'pc', 'pcc', 'ba', 'htn', 'dm', 'cad', 'appet', 'pe', 'ane', 'classification']
-    
     # Filter for columns that actually exist in the dataframe before one-hot encoding
-    existing_categorical_cols = [col for col in categorical_cols if col in df.columns]
-    
-    df = pd.get_dummies(df, columns=existing_categorical_cols, drop_first=True)
-
-    # Save the cleaned data
-    df.to_csv('data/kidney_cleaned.csv', index=False)
-    print("Kidney data cleaned and saved to 'data/kidney_cleaned.csv'")
-
-# --- Diabetes Dataset Cleaning ---
-def clean_diabetes_data(file_path):
-    """
-    Cleans the 'diabetes.csv' dataset by:
-    1. Replacing biologically impossible '0' values in certain columns with NaN.
-    2. Imputing these missing values with the mean of their respective columns.
-    """
-    print("Cleaning diabetes dataset...")
-    # Load the dataset
-    df = pd.read_csv(file_path)
-
-    # Replace '0' with NaN in columns where 0 is not a valid value
-    cols_to_replace = ['Glucose', 'BloodPressure', 'SkinThickness', 'Insulin', 'BMI']
-    for col in cols_to_replace:
-        df[col] = df[col].replace(0, np.nan)
-
-    # Impute missing values with the mean
-    for col in cols_to_replace:
-        df[col].fillna(df[col].mean(), inplace=True)
-
-    # Save the cleaned data
-    df.to_csv('data/diabetes_cleaned.csv', index=False)
-    print("Diabetes data cleaned and saved to 'data/diabetes_cleaned.csv'")
-
-# --- Heart Disease Dataset Cleaning ---
-def clean_heart_data(file_path):
-    """
-    Cleans the 'heart.csv' dataset by:
-    1. One-hot encoding categorical columns.
-    2. Converting boolean-like columns ('Y'/'N') to binary (1/0).
-    """
-    print("Cleaning heart disease dataset...")
-    # Load the dataset
-    df = pd.read_csv(file_path)
-
-    # One-hot encode the specified categorical columns
-    df = pd.get_dummies(df, columns=['ChestPainType', 'RestingECG', 'ST_Slope'], drop_first=True)
-
-    # Map 'M'/'F' to 1/0 for 'Sex'
-    df['Sex'] = df['Sex'].map({'M': 1, 'F': 0})
-
-    # Map 'Y'/'N' to 1/0 for 'ExerciseAngina'
-    df['ExerciseAngina'] = df['ExerciseAngina'].map({'Y': 1, 'N': 0})
-    
-    # Map 'Y'/'N' to 1/0 for 'HeartDisease' (if needed)
-    df['HeartDisease'] = df['HeartDisease'].replace({'Yes': 1, 'No': 0})
-
-    # Save the cleaned data
-    df.to_csv('data/heart_cleaned.csv', index=False)
-    print("Heart disease data cleaned and saved to 'data/heart_cleaned.csv'")
-
-# --- Hypertension Dataset Cleaning ---
-def clean_hypertension_data(file_path):
-    """
-    Cleans the 'hypertension_dataset.csv' by:
-    1. One-hot encoding all categorical columns.
-    """
-    print("Cleaning hypertension dataset...")
-    # Load the dataset
-    df = pd.read_csv(file_path)
-
-    # One-hot encode the categorical columns
-    categorical_cols = ['BP_History', 'Medication', 'Exercise_Level', 'Smoking_Status', 'Family_History', 'Has_Hypertension']
-    df = pd.get_dummies(df, columns=categorical_cols, drop_first=True)
+    categorical_cols = [col for col in config.get('categorical_cols', []) if col in df.columns]
+    if categorical_cols:
+        df = pd.get_dummies(df, columns=categorical_cols, drop_first=True)
 
     # Save the cleaned data
-    df.to_csv('data/hypertension_cleaned.csv', index=False)
-    print("Hypertension data cleaned and saved to 'data/hypertension_cleaned.csv'")
+    df.to_csv(config['output'], index=False)
+    print(f"{name.capitalize()} data cleaned and saved to '{config['output']}'")
 
 
-# Execute the cleaning functions with updated file paths
-clean_kidney_data('data/kidneydisease.csv')
-clean_diabetes_data('data/diabetes.csv')
-clean_heart_data('data/heart.csv')
-clean_hypertension_data('data/hypertension_dataset.csv')
+if __name__ == '__main__':
+    # Each dataset is independent, so clean them in parallel on separate processes
+    with ProcessPoolExecutor(max_workers=len(CLEANING_CONFIG)) as executor:
+        list(executor.map(clean_dataset, CLEANING_CONFIG.keys(), CLEANING_CONFIG.values()))
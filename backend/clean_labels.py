@@ -1,16 +1,24 @@
 import pandas as pd
-
-# Load your combined dataset
-df = pd.read_csv("data/combined_disease_dataset.csv")
+import numpy as np
 
 # Clean up "Yes"/"No" → 1/0 and fill missing values with 0
-cleanup_map = {"Yes": 1, "No": 0}
+# Values that are already 1/0 map to themselves so they survive the lookup.
+cleanup_map = {"Yes": 1, "No": 0, "1": 1, "0": 0, 1: 1, 0: 0}
 disease_columns = ['has_diabetes', 'has_heart_disease', 'has_hypertension']
 
-for col in disease_columns:
-    df[col] = df[col].replace(cleanup_map)
-    df[col] = df[col].fillna(0).astype(int)
+# Stream the combined dataset in chunks so it never has to fit in memory at once
+chunk_size = 200_000
+for i, df in enumerate(pd.read_csv("data/combined_disease_dataset.csv", chunksize=chunk_size)):
+    for col in disease_columns:
+        # A single map lookup with a compact int8 result instead of replace + fillna + astype(int).
+        # Only values that were missing in the input are filled; any other unmapped label is an error.
+        labels = df[col].map(cleanup_map)
+        unknown = labels.isna() & df[col].notna()
+        if unknown.any():
+            raise ValueError(f"Unexpected values in '{col}': {df.loc[unknown, col].unique().tolist()}")
+        df[col] = labels.fillna(0).astype(np.int8)
+
+    # Save cleaned version, writing the header with the first chunk only
+    df.to_csv("data/cleaned_disease_dataset.csv", index=False, mode='w' if i == 0 else 'a', header=i == 0)
 
-# Save cleaned version
-df.to_csv("data/cleaned_disease_dataset.csv", index=False)
 print("✅ Cleaned and saved to cleaned_disease_dataset.csv")
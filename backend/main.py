@@ -1,13 +1,22 @@
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import Dict, List, Any
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+from typing import Dict, List, Any, Optional
 from fastapi.middleware.cors import CORSMiddleware
 import pandas as pd
 import joblib
 import shap
+from sklearn.ensemble import GradientBoostingClassifier
 import warnings
 import os
+import math
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+# ONNX Runtime is optional; without it predictions are made with the scikit-learn models.
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
 
 # Suppress a known SHAP warning related to multiprocessing
 warnings.filterwarnings("ignore", category=UserWarning)
@@ -26,21 +35,18 @@ app.add_middleware(
 
 # A dictionary to store our pre-trained ensemble models.
 models = {}
-# A dictionary to store the SHAP TreeExplainer objects.
+# A dictionary to store ONNX Runtime sessions for models exported to ONNX at training time.
+onnx_sessions = {}
+# A dictionary to store (weight, SHAP TreeExplainer, output selector) entries for each member of the ensembles.
 explainers = {}
-# A dictionary to store the original datasets used for SHAP.
-datasets = {}
 # A dictionary to store the mean values of each feature for imputation.
 feature_means = {}
+# A dictionary to store the feature means as arrays aligned with the feature names.
+feature_means_arr = {}
 # A dictionary to store the feature names for each model.
 feature_names_dict = {}
-# A dictionary to map disease names to their target column.
-target_columns = {
-    'heart': 'HeartDisease',
-    'diabetes': 'Outcome',
-    'kidney': 'Chronic Kidney Disease: yes',
-    'hypertension': 'Has_Hypertension_Yes',
-}
+# A dictionary mapping every input model field to its position in the feature rows, per disease.
+input_feature_index = {}
 
 # Map simple disease names to the exact model filenames.
 model_filenames = {
@@ -50,119 +56,110 @@ model_filenames = {
     'diabetes': 'diabetes_prediction_ensemble_model.joblib',
 }
 
-# Load the models and data on application startup.
-try:
-    model_folder = 'models'
-    for disease in ['heart', 'diabetes', 'kidney', 'hypertension']:
-        model_filename = model_filenames[disease]
-        model_path = os.path.join(model_folder, model_filename)
-        
-        models[disease] = joblib.load(model_path)
-        
-        dataset_path = os.path.join('data', f'{disease}_cleaned.csv')
-        df = pd.read_csv(dataset_path)
-
-        df = pd.get_dummies(df, drop_first=True)
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                df[col] = pd.to_numeric(col, errors='coerce')
-            elif df[col].dtype == 'bool':
-                df[col] = df[col].astype(int)
-        
-        # Define feature names consistently for each disease
-        feature_names = df.drop(target_columns[disease], axis=1, errors='ignore').columns.tolist()
-        feature_names_dict[disease] = feature_names
 
-        feature_means[disease] = df.drop(target_columns[disease], axis=1, errors='ignore').mean()
-        
-        df.fillna(df.mean(), inplace=True)
-        datasets[disease] = df
+def load_model(disease: str):
+    """Helper function to load a saved ensemble model, memory-mapping its arrays from disk."""
+    model_path = os.path.join('models', model_filenames[disease])
+    return joblib.load(model_path, mmap_mode='r')
 
-    for disease in models:
-        rf_model = models[disease].estimators_[0]
-        
-        # Initialize SHAP explainer without the 'data' parameter to avoid potential alignment issues
-        explainers[disease] = shap.TreeExplainer(rf_model)
-        
-    print("All models, datasets, and SHAP explainers loaded successfully.")
 
-except FileNotFoundError as e:
-    print(f"Error loading files: {e}. Make sure the `models/` and `data/` directories exist and contain the required files.")
-    exit(1)
-except Exception as e:
-    print(f"An unexpected error occurred during startup: {e}")
-    exit(1)
+def shap_output_selector(shap_values_raw):
+    """Helper function to choose how to select the positive class SHAP values, based on a sample output."""
+    # Handle the different output formats of shap_values. The format is fixed per explainer,
+    # so this is decided once at startup instead of on every request.
+    if isinstance(shap_values_raw, list):
+        # Fallback for when SHAP returns a list of one array per class.
+        return lambda shap_values: shap_values[1]
+    elif shap_values_raw.ndim == 3:
+        # A single array with shape (n_rows, n_features, 2): select the positive class (index 1)
+        return lambda shap_values: shap_values[:, :, 1]
+    # For a single-class model or regression, shap_values is a single array.
+    return lambda shap_values: shap_values
 
 
 # Pydantic models to validate the input data for each disease.
-class HeartInput(BaseModel):
-    Age: float
-    Sex: float
-    RestingBP: float
-    Cholesterol: float
-    FastingBS: float
-    MaxHR: float
-    ExerciseAngina: float
-    Oldpeak: float
-    ChestPainType_ATA: float
-    ChestPainType_NAP: float
-    ChestPainType_TA: float
-    RestingECG_Normal: float
-    RestingECG_ST: float
-    ST_Slope_Flat: float
-    ST_Slope_Up: float
-
-class DiabetesInput(BaseModel):
-    Pregnancies: float
-    Glucose: float
-    BloodPressure: float
-    SkinThickness: float
-    Insulin: float
-    BMI: float
-    DiabetesPedigreeFunction: float
-    Age: float
-
-class KidneyInput(BaseModel):
-    Age_yrs: float
-    Blood_Pressure_mm_Hg: float
-    Specific_Gravity: float
-    Albumin: float
-    Sugar: float
-    Blood_Glucose_Random_mgs_dL: float
-    Blood_Urea_mgs_dL: float
-    Serum_Creatinine_mgs_dL: float
-    Sodium_mEq_L: float
-    Potassium_mEq_L: float
-    Hemoglobin_gms: float
-    Packed_Cell_Volume: float
-    White_Blood_Cells_cells_cmm: float
-    Red_Blood_Cells_millions_cmm: float
-    Red_Blood_Cells_normal: float
-    Pus_Cells_normal: float
-    Pus_Cell_Clumps_present: float
-    Bacteria_present: float
-    Hypertension_yes: float
-    Diabetes_Mellitus_yes: float
-    Coronary_Artery_Disease_yes: float
-    Appetite_poor: float
-    Pedal_Edema_yes: float
-    Anemia_yes: float
-
-class HypertensionInput(BaseModel):
-    Age: float
-    Salt_Intake: float
-    Stress_Score: float
-    Sleep_Duration: float
-    BMI: float
-    BP_History_Normal: float
-    BP_History_Prehypertension: float
-    Medication_Beta_Blocker: float
-    Medication_Diuretic: float
-    Medication_Other: float
-    Exercise_Level_Low: float
-    Exercise_Level_Moderate: float
-    Smoking_Status_Smoker: float
-    Family_History_Yes: float
+# Every feature is optional; missing or blank values are filled with the feature means.
+# Fields whose training column names are not valid identifiers use that column name as an alias.
+class DiseaseInput(BaseModel):
+    # Infinite values are rejected like any other invalid input
+    model_config = ConfigDict(populate_by_name=True, extra='ignore', allow_inf_nan=False)
+
+    @field_validator('*', mode='before')
+    @classmethod
+    def blank_to_none(cls, value):
+        """Treat blank form values and NaN as missing."""
+        if value == '' or (isinstance(value, float) and math.isnan(value)):
+            return None
+        return value
+
+class HeartInput(DiseaseInput):
+    Age: Optional[float] = None
+    Sex: Optional[float] = None
+    RestingBP: Optional[float] = None
+    Cholesterol: Optional[float] = None
+    FastingBS: Optional[float] = None
+    MaxHR: Optional[float] = None
+    ExerciseAngina: Optional[float] = None
+    Oldpeak: Optional[float] = None
+    ChestPainType_ATA: Optional[float] = None
+    ChestPainType_NAP: Optional[float] = None
+    ChestPainType_TA: Optional[float] = None
+    RestingECG_Normal: Optional[float] = None
+    RestingECG_ST: Optional[float] = None
+    ST_Slope_Flat: Optional[float] = None
+    ST_Slope_Up: Optional[float] = None
+
+class DiabetesInput(DiseaseInput):
+    Pregnancies: Optional[float] = None
+    Glucose: Optional[float] = None
+    BloodPressure: Optional[float] = None
+    SkinThickness: Optional[float] = None
+    Insulin: Optional[float] = None
+    BMI: Optional[float] = None
+    DiabetesPedigreeFunction: Optional[float] = None
+    Age: Optional[float] = None
+
+class KidneyInput(DiseaseInput):
+    Age_yrs: Optional[float] = Field(None, alias='Age (yrs)')
+    Blood_Pressure_mm_Hg: Optional[float] = Field(None, alias='Blood Pressure (mm/Hg)')
+    Specific_Gravity: Optional[float] = Field(None, alias='Specific Gravity')
+    Albumin: Optional[float] = None
+    Sugar: Optional[float] = None
+    Blood_Glucose_Random_mgs_dL: Optional[float] = Field(None, alias='Blood Glucose Random (mgs/dL)')
+    Blood_Urea_mgs_dL: Optional[float] = Field(None, alias='Blood Urea (mgs/dL)')
+    Serum_Creatinine_mgs_dL: Optional[float] = Field(None, alias='Serum Creatinine (mgs/dL)')
+    Sodium_mEq_L: Optional[float] = Field(None, alias='Sodium (mEq/L)')
+    Potassium_mEq_L: Optional[float] = Field(None, alias='Potassium (mEq/L)')
+    Hemoglobin_gms: Optional[float] = Field(None, alias='Hemoglobin (gms)')
+    Packed_Cell_Volume: Optional[float] = Field(None, alias='Packed Cell Volume')
+    White_Blood_Cells_cells_cmm: Optional[float] = Field(None, alias='White Blood Cells (cells/cmm)')
+    Red_Blood_Cells_millions_cmm: Optional[float] = Field(None, alias='Red Blood Cells (millions/cmm)')
+    Red_Blood_Cells_normal: Optional[float] = Field(None, alias='Red Blood Cells: normal')
+    Pus_Cells_normal: Optional[float] = Field(None, alias='Pus Cells: normal')
+    Pus_Cell_Clumps_present: Optional[float] = Field(None, alias='Pus Cell Clumps: present')
+    Bacteria_present: Optional[float] = Field(None, alias='Bacteria: present')
+    Hypertension_yes: Optional[float] = Field(None, alias='Hypertension: yes')
+    Diabetes_Mellitus_yes: Optional[float] = Field(None, alias='Diabetes Mellitus: yes')
+    Coronary_Artery_Disease_yes: Optional[float] = Field(None, alias='Coronary Artery Disease: yes')
+    Appetite_poor: Optional[float] = Field(None, alias='Appetite: poor')
+    Pedal_Edema_yes: Optional[float] = Field(None, alias='Pedal Edema: yes')
+    Anemia_yes: Optional[float] = Field(None, alias='Anemia: yes')
+
+class HypertensionInput(DiseaseInput):
+    Age: Optional[float] = None
+    Salt_Intake: Optional[float] = None
+    Stress_Score: Optional[float] = None
+    Sleep_Duration: Optional[float] = None
+    BMI: Optional[float] = None
+    BP_History_Normal: Optional[float] = None
+    BP_History_Prehypertension: Optional[float] = None
+    Medication_Beta_Blocker: Optional[float] = Field(None, alias='Medication_Beta Blocker')
+    Medication_Diuretic: Optional[float] = None
+    Medication_Other: Optional[float] = None
+    Exercise_Level_Low: Optional[float] = None
+    Exercise_Level_Moderate: Optional[float] = None
+    Smoking_Status_Smoker: Optional[float] = None
+    Family_History_Yes: Optional[float] = None
 
 
 def get_input_model(disease: str):
@@ -178,6 +175,167 @@ def get_input_model(disease: str):
     raise HTTPException(status_code=404, detail="Disease model not found")
 
 
+# Load the models and data on application startup.
+try:
+    diseases = ['heart', 'diabetes', 'kidney', 'hypertension']
+
+    # Loading the models is I/O-bound, so read them in parallel.
+    with ThreadPoolExecutor(max_workers=len(diseases)) as executor:
+        models.update(zip(diseases, executor.map(load_model, diseases)))
+
+    # Use the ONNX export of a model for predictions when it is available.
+    if ort is not None:
+        for disease in diseases:
+            model_path = os.path.join('models', model_filenames[disease])
+            onnx_path = model_path.replace('.joblib', '.onnx')
+            if not os.path.exists(onnx_path):
+                continue
+            # An export older than its joblib model is left over from an earlier training run
+            if os.path.getmtime(onnx_path) < os.path.getmtime(model_path):
+                print(f"Warning: '{onnx_path}' is older than '{model_path}', ignoring it.")
+                continue
+            onnx_sessions[disease] = ort.InferenceSession(onnx_path, providers=['CPUExecutionProvider'])
+
+    for disease in diseases:
+        # Define feature names consistently for each disease, in the order the model was trained on
+        feature_names = models[disease].feature_names_in_.tolist()
+        feature_names_dict[disease] = feature_names
+
+        # Map every input model field to its position in the feature rows, skipping fields the model lacks
+        input_feature_index[disease] = {}
+        for name, field in get_input_model(disease).model_fields.items():
+            column = field.alias or name
+            if column in feature_names:
+                input_feature_index[disease][name] = feature_names.index(column)
+            else:
+                print(f"Warning: input field '{column}' is not a feature of the {disease} model, ignoring it.")
+
+        # Only the feature columns are needed for the imputation means and the SHAP background sample
+        dataset_path = os.path.join('data', f'{disease}_cleaned.csv')
+        # usecols keeps the file's column order, so reorder the columns to match the model
+        df = pd.read_csv(dataset_path, usecols=feature_names)[feature_names]
+
+        # The cleaned files are already one-hot encoded, so every column is numeric or boolean.
+        # The tree models work on float32 internally, so keep the features in float32 too.
+        df = df.astype(np.float32)
+
+        feature_means[disease] = df.mean()
+        feature_means_arr[disease] = feature_means[disease].to_numpy(np.float32)
+
+        # Explain the whole soft-voting ensemble as the weighted sum of its members' SHAP values.
+        # The Random Forest's raw output is already a probability, so it uses the tree path dependent
+        # algorithm without background data. Gradient Boosting's raw output is in log-odds, so it is
+        # explained on the probability scale against a small background sample instead.
+        ensemble = models[disease]
+        weights = np.ones(len(ensemble.estimators_)) if ensemble.weights is None else np.asarray(ensemble.weights, dtype=np.float64)
+        weights = weights / weights.sum()
+        background = df.sample(n=min(100, len(df)), random_state=42).to_numpy()
+
+        member_explainers = []
+        for weight, estimator in zip(weights, ensemble.estimators_):
+            if isinstance(estimator, GradientBoostingClassifier):
+                explainer = shap.TreeExplainer(
+                    estimator,
+                    data=background,
+                    feature_perturbation='interventional',
+                    model_output='probability',
+                )
+            else:
+                explainer = shap.TreeExplainer(
+                    estimator,
+                    feature_perturbation='tree_path_dependent',
+                    model_output='raw',
+                )
+            # Probe the explainer once with the mean row to find its output format
+            sample_output = explainer.shap_values(feature_means_arr[disease].reshape(1, -1), check_additivity=False)
+            member_explainers.append((weight, explainer, shap_output_selector(sample_output)))
+        explainers[disease] = member_explainers
+
+    print("All models, feature means, and SHAP explainers loaded successfully.")
+
+except FileNotFoundError as e:
+    print(f"Error loading files: {e}. Make sure the `models/` and `data/` directories exist and contain the required files.")
+    exit(1)
+except Exception as e:
+    print(f"An unexpected error occurred during startup: {e}")
+    exit(1)
+
+
+def parse_input(disease: str, data: Dict[str, Any]) -> DiseaseInput:
+    """Helper function to validate the request data against the disease's input model."""
+    input_model = get_input_model(disease)
+    try:
+        return input_model.model_validate(data)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid input data: {e}")
+
+
+def build_input_row(disease: str, inputs: DiseaseInput) -> np.ndarray:
+    """Helper function to build a feature row, filling missing values with the feature means."""
+    # Start from the means and overwrite only the values that were provided
+    row = feature_means_arr[disease].copy()
+    for name, position in input_feature_index[disease].items():
+        value = getattr(inputs, name)
+        if value is not None:
+            row[position] = value
+    return row
+
+
+def predict_with_model(disease: str, X: np.ndarray):
+    """Helper function to get the predicted labels and positive class probabilities for a feature matrix."""
+    session = onnx_sessions.get(disease)
+    if session is not None:
+        labels, probabilities = session.run(None, {session.get_inputs()[0].name: X})
+        return labels, probabilities[:, 1]
+    model = models[disease]
+    return model.predict(X), model.predict_proba(X)[:, 1]
+
+
+def top_k_indices(values: np.ndarray, k: int) -> np.ndarray:
+    """Helper function to get the indices of the k largest values, largest first (ties keep their order)."""
+    if len(values) > k:
+        # Partition to find the k-th largest value, then keep everything at or above it
+        threshold = values[np.argpartition(-values, k - 1)[k - 1]]
+        candidates = np.flatnonzero(values >= threshold)
+    else:
+        candidates = np.arange(len(values))
+    return candidates[np.argsort(-values[candidates], kind='stable')][:k]
+
+
+def ensemble_shap_values(disease: str, X: np.ndarray) -> np.ndarray:
+    """Helper function to get the ensemble's positive class SHAP values as the weighted sum over its members."""
+    # The additivity check is disabled because minor floating-point differences make it fail.
+    return sum(
+        weight * select(explainer.shap_values(X, check_additivity=False))
+        for weight, explainer, select in explainers[disease]
+    )
+
+
+def summarize_shap_values(feature_names: List[str], shap_values: np.ndarray) -> Dict[str, List[Dict[str, Any]]]:
+    """Helper function to pick the five strongest positive and negative features for one row."""
+    # FINAL check to ensure no length mismatch.
+    if len(feature_names) != len(shap_values):
+        raise ValueError(
+            f"Feature names and SHAP values have mismatched lengths after all processing: "
+            f"Expected {len(feature_names)}, got {len(shap_values)}"
+        )
+
+    # Pick the five strongest features on each side without sorting the full list
+    abs_values = np.abs(shap_values)
+    positive_idx = np.flatnonzero(shap_values > 0)
+    negative_idx = np.flatnonzero(shap_values <= 0)
+    positive_idx = positive_idx[top_k_indices(abs_values[positive_idx], 5)]
+    negative_idx = negative_idx[top_k_indices(abs_values[negative_idx], 5)]
+
+    positive_features = [{"feature_name": feature_names[i], "shap_value": shap_values[i]} for i in positive_idx]
+    negative_features = [{"feature_name": feature_names[i], "shap_value": shap_values[i]} for i in negative_idx]
+
+    return {
+        "positive_features": positive_features,
+        "negative_features": negative_features
+    }
+
+
 @app.get("/")
 def read_root():
     """A simple root endpoint to confirm the API is running."""
@@ -193,20 +351,15 @@ def predict(disease_name: str, data: Dict[str, Any]):
     feature_names = feature_names_dict.get(disease_name)
     if model is None or feature_names is None:
         raise HTTPException(status_code=404, detail="Model or feature names for this disease not found.")
+    inputs = parse_input(disease_name, data)
 
     try:
-        # Create a DataFrame from the incoming data
-        input_df = pd.DataFrame([data])
-        
-        # Re-index the DataFrame to match the training data's column order.
-        input_df = input_df.reindex(columns=feature_names, fill_value=np.nan)
-
-        # Clean data and fill NaNs with pre-calculated means
-        input_df.replace('', np.nan, inplace=True)
-        input_df.fillna(feature_means[disease_name], inplace=True)
-        
-        prediction = model.predict(input_df)[0]
-        probability = model.predict_proba(input_df)[0][1]
+        # Build the row in the training data's column order, filling gaps with pre-calculated means
+        X = build_input_row(disease_name, inputs).reshape(1, -1)
+
+        predictions, probabilities = predict_with_model(disease_name, X)
+        prediction = predictions[0]
+        probability = probabilities[0]
 
         return {
             "prediction": int(prediction),
@@ -225,63 +378,69 @@ def explain(disease_name: str, data: Dict[str, Any]):
     feature_names = feature_names_dict.get(disease_name)
     if explainer is None or feature_names is None:
         raise HTTPException(status_code=404, detail="Explainer or feature names for this disease not found.")
+    inputs = parse_input(disease_name, data)
 
     try:
-        input_df = pd.DataFrame([data])
-        
         # This is the crucial step to prevent the mismatch.
-        # We explicitly reindex the input DataFrame to match the feature names list.
-        input_df = input_df.reindex(columns=feature_names, fill_value=np.nan)
-        input_df.replace('', np.nan, inplace=True)
-        input_df.fillna(feature_means[disease_name], inplace=True)
-        
-        # Get the raw SHAP values from the explainer.
-        shap_values_raw = explainer.shap_values(input_df)
-
-        # Handle the different output formats of shap_values.
-        # Based on the debug output, we know it's a single numpy array with shape (1, 15, 2)
-        if isinstance(shap_values_raw, list):
-            # Fallback for when SHAP returns a list of two arrays.
-            if len(shap_values_raw) == 2:
-                shap_values = shap_values_raw[1]
-            else:
-                raise ValueError("SHAP explainer returned a list of an unexpected length.")
-        elif isinstance(shap_values_raw, np.ndarray):
-            # The core fix for the (1, 15, 2) shape.
-            if shap_values_raw.ndim == 3 and shap_values_raw.shape[2] == 2:
-                # Select the SHAP values for the positive class (index 1)
-                shap_values = shap_values_raw[0, :, 1]
-            else:
-                # For a single-class model or regression, shap_values is a single array.
-                shap_values = shap_values_raw
-        else:
-            raise ValueError("SHAP values format is not as expected.")
-        
-        # Flatten the selected array into a 1D vector.
-        shap_values = shap_values.flatten()
-
-        # FINAL check to ensure no length mismatch.
-        if len(feature_names) != len(shap_values):
-            raise ValueError(
-                f"Feature names and SHAP values have mismatched lengths after all processing: "
-                f"Expected {len(feature_names)}, got {len(shap_values)}"
-            )
-
-        shap_tuples = list(zip(feature_names, shap_values))
-        shap_tuples.sort(key=lambda x: abs(x[1]), reverse=True)
-
-        positive_features = []
-        negative_features = []
-
-        for feature, shap_value in shap_tuples:
-            if shap_value > 0:
-                positive_features.append({"feature_name": feature, "shap_value": shap_value})
-            else:
-                negative_features.append({"feature_name": feature, "shap_value": shap_value})
+        # The row is built explicitly in the order of the feature names list.
+        X = build_input_row(disease_name, inputs).reshape(1, -1)
 
-        return {
-            "positive_features": positive_features[:5],
-            "negative_features": negative_features[:5]
-        }
+        # Get the SHAP values for the whole ensemble, passing the NumPy row directly.
+        shap_values = ensemble_shap_values(disease_name, X)
+
+        return summarize_shap_values(feature_names, shap_values[0])
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"SHAP explanation failed: {str(e)}")
+
+
+@app.post("/predict_batch/{disease_name}")
+def predict_batch(disease_name: str, rows: List[Dict[str, Any]]):
+    """
+    Endpoint to make predictions for several inputs of a given disease in a single model call.
+    """
+    model = models.get(disease_name)
+    feature_names = feature_names_dict.get(disease_name)
+    if model is None or feature_names is None:
+        raise HTTPException(status_code=404, detail="Model or feature names for this disease not found.")
+    inputs = [parse_input(disease_name, data) for data in rows]
+    if not inputs:
+        return []
+
+    try:
+        # Stack all rows into one matrix so the trees are traversed once for the whole batch
+        X = np.stack([build_input_row(disease_name, row) for row in inputs])
+
+        predictions, probabilities = predict_with_model(disease_name, X)
+
+        return [
+            {
+                "prediction": int(prediction),
+                "probability_has_disease": float(probability)
+            }
+            for prediction, probability in zip(predictions, probabilities)
+        ]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+
+
+@app.post("/explain_batch/{disease_name}")
+def explain_batch(disease_name: str, rows: List[Dict[str, Any]]):
+    """
+    Endpoint to provide SHAP explanations for several inputs of a given disease in a single explainer call.
+    """
+    explainer = explainers.get(disease_name)
+    feature_names = feature_names_dict.get(disease_name)
+    if explainer is None or feature_names is None:
+        raise HTTPException(status_code=404, detail="Explainer or feature names for this disease not found.")
+    inputs = [parse_input(disease_name, data) for data in rows]
+    if not inputs:
+        return []
+
+    try:
+        X = np.stack([build_input_row(disease_name, row) for row in inputs])
+
+        shap_values = ensemble_shap_values(disease_name, X)
+
+        return [summarize_shap_values(feature_names, row_values) for row_values in shap_values]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"SHAP explanation failed: {str(e)}")
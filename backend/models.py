@@ -8,6 +8,13 @@ import joblib
 import os
 import warnings
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# skl2onnx is optional; without it the ensemble is only saved with joblib.
+try:
+    from skl2onnx import to_onnx
+except ImportError:
+    to_onnx = None
 
 # Suppress a known warning from SHAP and other libraries
 warnings.filterwarnings("ignore", category=UserWarning)
@@ -42,20 +49,25 @@ def train_and_explain_models(file_path, target_column, model_title):
     
     # *** NEW: Robustly convert any remaining non-numeric columns to numeric. ***
     # This specifically addresses the boolean columns causing the SHAP error.
-    for col in df.columns:
-        if df[col].dtype == 'object':
-            print(f"  --> Converting object column '{col}' to numeric...")
-            # Use pd.to_numeric with errors='coerce' to convert non-numeric
-            # values to NaN, which will be handled next.
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-        elif df[col].dtype == 'bool':
-            print(f"  --> Converting boolean column '{col}' to int...")
-            # Convert boolean True/False to 1/0
-            df[col] = df[col].astype(int)
-    
+    bool_cols = df.select_dtypes(include='bool').columns
+    if len(bool_cols):
+        print(f"  --> Converting boolean columns {list(bool_cols)} to int...")
+        # Convert boolean True/False to 1/0
+        df[bool_cols] = df[bool_cols].astype(np.int8)
+
+    obj_cols = df.select_dtypes(include='object').columns
+    if len(obj_cols):
+        print(f"  --> Converting object columns {list(obj_cols)} to numeric...")
+        # Use pd.to_numeric with errors='coerce' to convert non-numeric
+        # values to NaN, which will be handled next.
+        df[obj_cols] = df[obj_cols].apply(pd.to_numeric, errors='coerce')
+
     # Fill any remaining missing values with the mean of the column.
-    # This ensures all data is numeric and no NaNs exist.
-    df.fillna(df.mean(), inplace=True)
+    # This ensures all data is numeric and no NaNs exist. Means are only
+    # computed for the columns that actually have missing values.
+    na_cols = df.columns[df.isna().any()]
+    if len(na_cols):
+        df[na_cols] = df[na_cols].fillna(df[na_cols].mean())
     
     # Separate features (X) and target (y)
     if target_column not in df.columns:
@@ -63,7 +75,8 @@ def train_and_explain_models(file_path, target_column, model_title):
         return
         
     y = df[target_column]
-    X = df.drop(target_column, axis=1)
+    # The tree models work on float32 internally, so cast the features once up front
+    X = df.drop(target_column, axis=1).astype(np.float32)
     
     # Final check to confirm all features are numeric before training
     if not all(pd.api.types.is_numeric_dtype(X[col]) for col in X.columns):
@@ -79,7 +92,7 @@ def train_and_explain_models(file_path, target_column, model_title):
     
     # Initialize and train the individual models
     print("Training Random Forest Classifier...")
-    rf_model = RandomForestClassifier(n_estimators=100, random_state=42)
+    rf_model = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=-1)
     rf_model.fit(X_train, y_train)
     
     print("Training Gradient Boosting Classifier...")
@@ -88,10 +101,13 @@ def train_and_explain_models(file_path, target_column, model_title):
     
     # Combine the models using a VotingClassifier
     print("Training Voting Classifier (Ensemble Model)...")
+    # The weights are an array and flatten_transform is off because the ONNX converter
+    # requires both; neither affects the predictions.
     ensemble_model = VotingClassifier(
         estimators=[('rf', rf_model), ('gb', gb_model)],
         voting='soft',
-        weights=[0.5, 0.5]
+        weights=np.array([0.5, 0.5]),
+        flatten_transform=False
     )
     ensemble_model.fit(X_train, y_train)
     
@@ -110,13 +126,35 @@ def train_and_explain_models(file_path, target_column, model_title):
     # --- Save the trained ensemble model ---
     model_folder = 'models'
     if not os.path.exists(model_folder):
-        os.makedirs(model_folder)
+        # exist_ok guards against another training process creating it first
+        os.makedirs(model_folder, exist_ok=True)
         print(f"Created directory: '{model_folder}'")
 
     model_filename = f'{model_title.lower().replace(" ", "_")}_ensemble_model.joblib'
     model_path = os.path.join(model_folder, model_filename)
+    onnx_path = model_path.replace('.joblib', '.onnx')
+    # Remove the ONNX export of an earlier run before saving the new model, so the API never
+    # serves a stale ONNX model next to it if the export below is skipped or fails.
+    if os.path.exists(onnx_path):
+        os.remove(onnx_path)
     joblib.dump(ensemble_model, model_path)
     print(f"\nEnsemble model saved to '{model_path}'")
+
+    # --- Export the ensemble to ONNX for faster inference in the API ---
+    if to_onnx is None:
+        print("skl2onnx is not installed, skipping the ONNX export.")
+    else:
+        try:
+            # Disable the ZipMap output so probabilities come back as a plain array
+            onnx_model = to_onnx(ensemble_model, X_train[:1].to_numpy(), options={'zipmap': False})
+            with open(onnx_path, 'wb') as f:
+                f.write(onnx_model.SerializeToString())
+            print(f"ONNX model saved to '{onnx_path}'")
+        except Exception as e:
+            # Do not leave a partially written file behind
+            if os.path.exists(onnx_path):
+                os.remove(onnx_path)
+            print(f"ONNX export failed, the API will use the joblib model: {e}")
     
     # --- SHAP for Model Explanation ---
     print("\nGenerating SHAP explanation for the Random Forest model within the Ensemble...")
@@ -137,31 +175,22 @@ def train_and_explain_models(file_path, target_column, model_title):
     plot_filename = f'{model_title.lower().replace(" ", "_")}_shap_summary.png'
     plt.savefig(plot_filename, bbox_inches='tight')
     plt.show()
+    # Close the figure so a later model trained in the same process starts from a clean plot
+    plt.close()
     print(f"SHAP summary plot saved as '{plot_filename}'")
     
 
 # --- Execute the function for each dataset ---
 # The file_path includes the 'data/' folder as you specified
-train_and_explain_models(
-    file_path='data/kidney_cleaned.csv',
-    target_column='Chronic Kidney Disease: yes',
-    model_title='Kidney Disease Prediction'
-)
-
-train_and_explain_models(
-    file_path='data/diabetes_cleaned.csv',
-    target_column='Outcome',
-    model_title='Diabetes Prediction'
-)
-
-train_and_explain_models(
-    file_path='data/heart_cleaned.csv',
-    target_column='HeartDisease',
-    model_title='Heart Disease Prediction'
-)
+# Each entry is (file_path, target_column, model_title)
+TRAINING_TASKS = [
+    ('data/kidney_cleaned.csv', 'Chronic Kidney Disease: yes', 'Kidney Disease Prediction'),
+    ('data/diabetes_cleaned.csv', 'Outcome', 'Diabetes Prediction'),
+    ('data/heart_cleaned.csv', 'HeartDisease', 'Heart Disease Prediction'),
+    ('data/hypertension_cleaned.csv', 'Has_Hypertension_Yes', 'Hypertension Prediction'),
+]
 
-train_and_explain_models(
-    file_path='data/hypertension_cleaned.csv',
-    target_column='Has_Hypertension_Yes',
-    model_title='Hypertension Prediction'
-)
+if __name__ == '__main__':
+    # The datasets are independent, so train them in parallel on separate processes
+    with ProcessPoolExecutor(max_workers=len(TRAINING_TASKS)) as executor:
+        list(executor.map(train_and_explain_models, *zip(*TRAINING_TASKS)))
@@ -1,50 +1,218 @@
-# First, you need to import the necessary functions from scikit-learn
-from sklearn.metrics import accuracy_score, precision_score, recall_score, confusion_matrix
-
-# In a real scenario, you would get y_test from your data split
-# and y_pred from your model's predictions.
-# For this example, let's use some placeholder data to show how it works.
-# Let's imagine our model's predictions (y_pred) and the actual values (y_test)
-# The values are 0 (no stroke) and 1 (stroke)
-# y_test represents the ground truth, y_pred represents the model's guess
-y_test = [0, 1, 0, 1, 0, 0, 1, 0, 1, 1, 0, 0]
-y_pred = [0, 1, 0, 0, 0, 1, 1, 0, 1, 1, 0, 0]
-
-# Now, we'll calculate the metrics
-print("--- Model Performance Metrics ---")
-
-# 1. Accuracy Score
-# This measures the overall percentage of correct predictions.
-accuracy = accuracy_score(y_test, y_pred)
-print(f"Accuracy: {accuracy:.2f}")
-
-# 2. Precision Score
-# This measures the proportion of positive identifications that were actually correct.
-# In a medical context, it tells you how trustworthy your model's "stroke" predictions are.
-# A high precision means when the model says "stroke", it's usually right.
-# We need to specify `pos_label=1` because 'stroke' is our positive class.
-precision = precision_score(y_test, y_pred, pos_label=1)
-print(f"Precision: {precision:.2f}")
-
-# 3. Recall Score
-# This measures the proportion of actual positives that were identified correctly.
-# In a medical context, it tells you how good your model is at finding all the
-# patients who actually have a stroke. A high recall means it's less likely to miss a case.
-recall = recall_score(y_test, y_pred, pos_label=1)
-print(f"Recall: {recall:.2f}")
-
-# 4. Confusion Matrix (for more detail)
-# This gives you a full breakdown of the TP, TN, FP, and FN.
-conf_matrix = confusion_matrix(y_test, y_pred)
-print("\nConfusion Matrix:")
-print(conf_matrix)
-# The output matrix is structured as follows:
-# [[TN, FP],
-#  [FN, TP]]
-
-# To make the matrix easier to read:
-tn, fp, fn, tp = conf_matrix.ravel()
-print(f"\nTrue Positives (TP): {tp}")   # Correctly predicted a stroke
-print(f"True Negatives (TN): {tn}")   # Correctly predicted no stroke
-print(f"False Positives (FP): {fp}") # Incorrectly predicted a stroke (Type I error)
-print(f"False Negatives (FN): {fn}") # Incorrectly predicted no stroke (Type II error)
+# First, you need to import NumPy; the metrics are computed directly from the confusion matrix
+import sys
+import numpy as np
+from numba import njit, prange
+
+# CuPy is optional; without it (or without a CUDA device) everything runs on the CPU.
+# It is imported and the device checked on the first input large enough to use it,
+# so importing this module does not start the CUDA runtime.
+cp = None
+_gpu_available = None
+
+# Template for the TP/TN/FP/FN breakdown, built once at import instead of per report.
+_BREAKDOWN_TEMPLATE = (
+    "True Positives (TP): {}\n"    # Correctly predicted a stroke
+    "True Negatives (TN): {}\n"    # Correctly predicted no stroke
+    "False Positives (FP): {}\n"   # Incorrectly predicted a stroke (Type I error)
+    "False Negatives (FN): {}"     # Incorrectly predicted no stroke (Type II error)
+).format
+
+# Below this many labels the NumPy popcount path is cheaper than calling the compiled kernel
+# (which is only compiled the first time it is used).
+NUMBA_MIN_SIZE = 100_000
+# From this many labels on, copying them to the GPU pays off when one is available.
+GPU_MIN_SIZE = 1_000_000
+
+
+@njit(cache=True, parallel=True, boundscheck=False)
+def _binary_cm(yt, yp):
+    """Counts TN, FP, FN and TP for 0/1 uint8 labels in one branch-free parallel loop."""
+    fp = fn = tp = 0
+    for i in prange(yt.shape[0]):
+        t = yt[i]
+        p = yp[i]
+        tp += t & p
+        fn += t & (1 - p)
+        fp += (1 - t) & p
+    tn = yt.shape[0] - fp - fn - tp
+    return tn, fp, fn, tp
+
+
+def gpu_available():
+    """Returns whether CuPy and a CUDA device are available, checking only on the first call."""
+    global cp, _gpu_available
+    if _gpu_available is None:
+        try:
+            import cupy
+            _gpu_available = cupy.cuda.runtime.getDeviceCount() > 0
+            cp = cupy
+        except Exception:
+            _gpu_available = False
+    return _gpu_available
+
+
+def _cupy_cm(yt, yp):
+    """Counts TN, FP, FN and TP on the GPU with boolean masks, returning them to the host in one copy."""
+    t = cp.asarray(yt, dtype=cp.uint8) == 1
+    pos = cp.asarray(yp, dtype=cp.uint8) == 1
+    tp = cp.count_nonzero(t & pos)
+    fp = cp.count_nonzero(pos) - tp
+    fn = cp.count_nonzero(t) - tp
+    tn = yt.shape[0] - tp - fp - fn
+    return cp.stack([tn, fp, fn, tp]).get()
+
+
+def _pack_bits(y):
+    """Packs 0/1 uint8 labels into uint64 words, 64 samples per word (zero padded)."""
+    packed = np.packbits(y)
+    return np.pad(packed, (0, -packed.shape[0] % 8)).view(np.uint64)
+
+
+def _bitpacked_cm(yt, yp):
+    """Counts TN, FP, FN and TP by popcounting the AND-ed bit-packed labels."""
+    t = _pack_bits(yt)
+    p = _pack_bits(yp)
+    # The zero padding never sets a bit in any of the three masks below.
+    tp = int(np.bitwise_count(t & p).sum())
+    fn = int(np.bitwise_count(t & ~p).sum())
+    fp = int(np.bitwise_count(~t & p).sum())
+    tn = yt.shape[0] - tp - fn - fp
+    return tn, fp, fn, tp
+
+
+def binary_confusion_matrix(yt, yp):
+    """Builds the 2x2 confusion matrix [[TN, FP], [FN, TP]] for 0/1 uint8 labels."""
+    # The kernels below read both arrays by position without bounds checks
+    if yt.ndim != 1 or yt.shape != yp.shape:
+        raise ValueError(f"y_test and y_pred must be 1-D arrays of the same length, got shapes {yt.shape} and {yp.shape}.")
+    # The backends only agree on 0/1 labels (bit packing treats any nonzero value as 1)
+    if yt.max(initial=0) > 1 or yp.max(initial=0) > 1:
+        raise ValueError("y_test and y_pred must only contain the binary labels 0 and 1.")
+
+    if yt.shape[0] >= GPU_MIN_SIZE and gpu_available():
+        tn, fp, fn, tp = _cupy_cm(yt, yp)
+    elif yt.shape[0] >= NUMBA_MIN_SIZE:
+        tn, fp, fn, tp = _binary_cm(yt, yp)
+    else:
+        tn, fp, fn, tp = _bitpacked_cm(yt, yp)
+    return np.array([[tn, fp], [fn, tp]])
+
+
+def report(y_test, y_pred):
+    """
+    Prints the model performance metrics for binary 0/1 labels.
+
+    The confusion matrix is computed exactly once and accuracy, precision and
+    recall are all derived from its four cells.
+
+    Args:
+        y_test: The ground truth labels.
+        y_pred: The model's predicted labels.
+
+    Returns:
+        dict: The accuracy, precision, recall and confusion matrix.
+    """
+    # Convert the labels to compact arrays once, so every metric below reuses them
+    yt = np.asarray(y_test, dtype=np.uint8)
+    yp = np.asarray(y_pred, dtype=np.uint8)
+
+    # Confusion Matrix, built in a single pass over the labels.
+    return report_confusion_matrix(binary_confusion_matrix(yt, yp))
+
+
+def report_confusion_matrix(conf_matrix):
+    """
+    Prints the model performance metrics derived from a 2x2 confusion matrix
+    structured as [[TN, FP], [FN, TP]].
+
+    Returns:
+        dict: The accuracy, precision, recall and confusion matrix.
+    """
+    # Read the four cells directly (no flattened copy) as plain Python ints,
+    # which keeps the metric arithmetic below free of NumPy scalar overhead.
+    tn, fp = int(conf_matrix[0, 0]), int(conf_matrix[0, 1])
+    fn, tp = int(conf_matrix[1, 0]), int(conf_matrix[1, 1])
+
+    # Now, we'll calculate the metrics
+
+    # 1. Accuracy Score
+    # This measures the overall percentage of correct predictions.
+    # The max(..., 1) guards keep an empty input from dividing by zero.
+    accuracy = (tp + tn) / max(tp + tn + fp + fn, 1)
+
+    # 2. Precision Score
+    # This measures the proportion of positive identifications that were actually correct.
+    # In a medical context, it tells you how trustworthy your model's "stroke" predictions are.
+    # A high precision means when the model says "stroke", it's usually right.
+    # 'stroke' (1) is our positive class; with no positive predictions precision is 0.
+    precision = tp / max(tp + fp, 1)
+
+    # 3. Recall Score
+    # This measures the proportion of actual positives that were identified correctly.
+    # In a medical context, it tells you how good your model is at finding all the
+    # patients who actually have a stroke. A high recall means it's less likely to miss a case.
+    recall = tp / max(tp + fn, 1)
+
+    # Build the whole report first and write it out in a single call.
+    lines = [
+        "--- Model Performance Metrics ---",
+        f"Accuracy: {accuracy:.2f}",
+        f"Precision: {precision:.2f}",
+        f"Recall: {recall:.2f}",
+        # 4. Confusion Matrix (for more detail)
+        # This gives you a full breakdown of the TP, TN, FP, and FN.
+        # The output matrix is structured as follows:
+        # [[TN, FP],
+        #  [FN, TP]]
+        "",
+        "Confusion Matrix:",
+        np.array2string(conf_matrix),
+        # To make the matrix easier to read:
+        "",
+        _BREAKDOWN_TEMPLATE(tp, tn, fp, fn),
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
+
+    return {
+        "accuracy": accuracy,
+        "precision": precision,
+        "recall": recall,
+        "confusion_matrix": conf_matrix,
+    }
+
+
+def confusion_matrix_accumulator(device="cpu"):
+    """
+    Creates a torchmetrics BinaryConfusionMatrix on the given device.
+
+    Inside a training or validation loop, call `accumulator.update(preds, targets)`
+    with the batch tensors already on that device, then pass the accumulator to
+    report_accumulated() at the end of the epoch. This avoids copying every batch
+    back to the CPU just to compute the metrics.
+    """
+    # torchmetrics is optional and pulls in torch, so it is only imported here
+    try:
+        from torchmetrics.classification import BinaryConfusionMatrix
+    except ImportError as e:
+        raise ImportError("torchmetrics is required to accumulate metrics on-device.") from e
+    return BinaryConfusionMatrix().to(device)
+
+
+def report_accumulated(accumulator):
+    """Prints the metrics for everything accumulated so far, copying only the 2x2 matrix to the CPU."""
+    return report_confusion_matrix(accumulator.compute().cpu().numpy())
+
+
+# Run the example only when executed as a script, so importing this module has no side effects.
+if __name__ == '__main__':
+    # In a real scenario, you would get y_test from your data split
+    # and y_pred from your model's predictions.
+    # For this example, let's use some placeholder data to show how it works.
+    # Let's imagine our model's predictions (y_pred) and the actual values (y_test)
+    # The values are 0 (no stroke) and 1 (stroke)
+    # y_test represents the ground truth, y_pred represents the model's guess
+    # They are stored as contiguous uint8 arrays, so report() can use them without a conversion.
+    y_test = np.array([0, 1, 0, 1, 0, 0, 1, 0, 1, 1, 0, 0], dtype=np.uint8)
+    y_pred = np.array([0, 1, 0, 0, 0, 1, 1, 0, 1, 1, 0, 0], dtype=np.uint8)
+
+    report(y_test, y_pred)